@@ -12,8 +12,22 @@ ACTION_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 echo "[INFO] Action Directory: $ACTION_DIR"
 echo "[INFO] Target Language: $TARGET_LANG"
 echo "[INFO] Mode: ${MODE:-translate}"
+echo "[INFO] Backend: ${TRANSLATOR_BACKEND:-llama-cpp}"
+
+BACKEND_ARGS=(--backend "${TRANSLATOR_BACKEND:-llama-cpp}")
+if [ "$TRANSLATOR_BACKEND" == "http" ]; then
+    BACKEND_ARGS+=(--server-url "$TRANSLATOR_SERVER_URL" --concurrency "${TRANSLATOR_CONCURRENCY:-4}" --max-retries "${TRANSLATOR_MAX_RETRIES:-3}" \
+        --timeout "${TRANSLATOR_TIMEOUT:-600}")
+    if [ -n "$TRANSLATOR_API_MODEL" ]; then
+        BACKEND_ARGS+=(--api-model "$TRANSLATOR_API_MODEL")
+    fi
+fi
+if [ -n "$TRANSLATOR_CHAT_TEMPLATE" ]; then
+    BACKEND_ARGS+=(--chat-template "$TRANSLATOR_CHAT_TEMPLATE")
+fi
 
-if [ "$MODE" != "navbar" ]; then
+# The http backend only needs the standard library, so skip the model entirely
+if [ "$MODE" != "navbar" ] && [ "$TRANSLATOR_BACKEND" != "http" ]; then
     echo "[INFO] Installing dependencies..."
     pip install -r "$ACTION_DIR/requirements.txt"
 
@@ -40,6 +54,7 @@ python "$ACTION_DIR/translator/translate.py" \
   --lang "$TARGET_LANG" \
   --nav-target "$NAV_TARGET" \
   --model-path "${MODEL_FILE:-}" \
-  --mode "${MODE:-translate}"
+  --mode "${MODE:-translate}" \
+  "${BACKEND_ARGS[@]}"
 
 echo "[SUCCESS] Entrypoint finished."
\ No newline at end of file
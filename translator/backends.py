@@ -0,0 +1,288 @@
+"""
+Inference backends for the README translator action.
+Provides the in-process llama.cpp backend and a pooled HTTP backend
+for OpenAI-compatible completion servers (llama.cpp server, vLLM, ...).
+"""
+
+import http.client
+import json
+import math
+import queue
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Chat templates keyed by name. Each entry renders a (system, user) pair into a
+# raw completion prompt and lists the stop sequences that end the assistant turn.
+CHAT_TEMPLATES = {
+    "chatml": {
+        "prompt": ("<|im_start|>system\n/no_think{system}<|im_end|>\n" "<|im_start|>user\n{user}<|im_end|>\n" "<|im_start|>assistant\n"),
+        "stop": ["<|im_end|>"],
+    },
+    "llama3": {
+        "prompt": (
+            "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system}<|eot_id|>"
+            "<|start_header_id|>user<|end_header_id|>\n\n{user}<|eot_id|>"
+            "<|start_header_id|>assistant<|end_header_id|>\n\n"
+        ),
+        "stop": ["<|eot_id|>"],
+    },
+    # Gemma has no system role; the system prompt opens the first user turn
+    "gemma": {
+        "prompt": ("<start_of_turn>user\n{system}\n\n{user}<end_of_turn>\n" "<start_of_turn>model\n"),
+        "stop": ["<end_of_turn>"],
+    },
+}
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class BackendError(RuntimeError):
+    """Raised when a backend cannot produce a completion."""
+
+
+def parse_retry_after(value):
+    """Parse a `Retry-After` header (delta-seconds or HTTP-date).
+
+    Args:
+        value (str): Header value, or None.
+
+    Returns:
+        float: Seconds to wait (possibly inf), or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return None if math.isnan(seconds) else max(0.0, seconds)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def render_prompt(template_name, system_content, text):
+    """Render a system/user pair with the named chat template.
+
+    Args:
+        template_name (str): Key into CHAT_TEMPLATES.
+        system_content (str): System prompt.
+        text (str): User message (the chunk to translate).
+
+    Returns:
+        tuple: (prompt, stop) where stop is the list of stop sequences.
+    """
+    if template_name not in CHAT_TEMPLATES:
+        raise ValueError(f"Unknown chat template '{template_name}'. Available: {', '.join(sorted(CHAT_TEMPLATES))}")
+    template = CHAT_TEMPLATES[template_name]
+    return template["prompt"].format(system=system_content, user=text), list(template["stop"])
+
+
+class InferenceBackend:
+    """Base class for inference backends.
+
+    Subclasses implement `_complete` for a fully rendered prompt; the chat
+    template is a property of the backend, so callers only pass the system
+    prompt and the text.
+    """
+
+    default_template = "chatml"
+
+    def __init__(self, chat_template=None, concurrency=1):
+        self.chat_template = chat_template or self.default_template
+        self.concurrency = max(1, int(concurrency))
+        # Fail early on typos instead of on the first chunk
+        render_prompt(self.chat_template, "", "")
+
+    def complete(self, system_content, text, max_tokens):
+        """Generate a completion for `text` under `system_content`.
+
+        Args:
+            system_content (str): System prompt.
+            text (str): User message.
+            max_tokens (int): Generation limit.
+
+        Returns:
+            str: Raw completion text.
+        """
+        prompt, stop = render_prompt(self.chat_template, system_content, text)
+        return self._complete(prompt, max_tokens, stop)
+
+    def _complete(self, prompt, max_tokens, stop):
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class LlamaCppBackend(InferenceBackend):
+    """In-process backend running a GGUF model through llama-cpp-python.
+
+    A single `Llama` instance is not thread-safe, so concurrency is fixed at 1.
+    """
+
+    def __init__(self, model_path, chat_template=None, n_ctx=8192, n_threads=4):
+        super().__init__(chat_template=chat_template, concurrency=1)
+        from llama_cpp import Llama  # pylint: disable=import-outside-toplevel
+
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, verbose=False)
+
+    def _complete(self, prompt, max_tokens, stop):
+        response = self.llm(prompt, max_tokens=max_tokens, temperature=0, stop=stop)
+        return response["choices"][0]["text"]
+
+
+class HttpBackend(InferenceBackend):
+    """Backend for an OpenAI-compatible `/v1/completions` endpoint.
+
+    Keeps a pool of persistent (keep-alive) connections sized to the
+    configured concurrency, and retries transient failures with
+    exponential backoff, or after the server's `Retry-After` delay as long
+    as it does not exceed `max_retry_after` seconds.
+    """
+
+    def __init__(self, server_url, model="", api_key="", chat_template=None, concurrency=4, max_retries=3, timeout=600.0, backoff=1.0, max_retry_after=120.0):
+        super().__init__(chat_template=chat_template, concurrency=concurrency)
+        parsed = urlparse(server_url if "://" in server_url else f"http://{server_url}")
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Invalid server URL '{server_url}'")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        # Accept the base URL as well as the full `/v1/completions` endpoint
+        base_path = parsed.path.rstrip("/")
+        if base_path.endswith("/chat/completions"):
+            raise ValueError(f"Invalid server URL '{server_url}': the http backend uses the plain /v1/completions endpoint, not /chat/completions")
+        for suffix in ("/v1/completions", "/v1"):
+            if base_path.endswith(suffix):
+                base_path = base_path[: -len(suffix)]
+                break
+        self.path = f"{base_path}/v1/completions"
+
+        self.model = model
+        self.api_key = api_key
+        self.max_retries = max(0, int(max_retries))
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+
+        # LIFO keeps recently used (still warm) connections at the front
+        self._pool = queue.LifoQueue()
+        for _ in range(self.concurrency):
+            self._pool.put(None)
+
+    def _new_connection(self):
+        conn_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return conn_cls(self.host, self.port, timeout=self.timeout)
+
+    def _post(self, conn, body):
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        conn.request("POST", self.path, body=body, headers=headers)
+        response = conn.getresponse()
+        # Always drain the body so the connection can be reused
+        return response.status, response.headers, response.read(), response.will_close
+
+    def _complete(self, prompt, max_tokens, stop):
+        payload = {"prompt": prompt, "max_tokens": max_tokens, "temperature": 0, "stop": stop}
+        if self.model:
+            payload["model"] = self.model
+        body = json.dumps(payload).encode("utf-8")
+
+        conn = self._pool.get()
+        try:
+            last_error = None
+            retry_after = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    # Honour the server's Retry-After (typically sent with 429/503)
+                    delay = retry_after if retry_after is not None else self.backoff * (2 ** (attempt - 1))
+                    retry_after = None
+                    print(f"[WARN] Completion request failed ({last_error}), retry {attempt}/{self.max_retries} in {delay:.1f}s", flush=True)
+                    time.sleep(delay)
+
+                if conn is None:
+                    conn = self._new_connection()
+                try:
+                    status, headers, data, will_close = self._post(conn, body)
+                except (OSError, http.client.HTTPException) as e:
+                    # Stale keep-alive socket or server unreachable: reconnect next attempt
+                    conn.close()
+                    conn = None
+                    last_error = f"{type(e).__name__}: {e}"
+                    continue
+
+                if will_close:
+                    conn.close()
+                    conn = None
+
+                if status in RETRYABLE_STATUSES:
+                    last_error = f"HTTP {status}"
+                    retry_after = parse_retry_after(headers.get("Retry-After"))
+                    if retry_after is not None and retry_after > self.max_retry_after and attempt < self.max_retries:
+                        raise BackendError(f"Server asked to retry after {retry_after:.0f}s ({last_error}), over the {self.max_retry_after:.0f}s limit")
+                    continue
+                if status != 200:
+                    raise BackendError(f"Server returned HTTP {status}: {data[:500].decode('utf-8', 'replace')}")
+
+                try:
+                    return json.loads(data)["choices"][0]["text"]
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    raise BackendError(f"Malformed completion response: {data[:500].decode('utf-8', 'replace')}") from e
+
+            raise BackendError(f"Completion request failed after {self.max_retries + 1} attempts: {last_error}")
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                conn.close()
+
+
+def create_backend(backend, model_path="", server_url="", api_model="", api_key="", chat_template=None, concurrency=4, max_retries=3, timeout=600.0):
+    """Build the inference backend selected on the command line.
+
+    Args:
+        backend (str): 'llama-cpp' or 'http'.
+        model_path (str): GGUF path for the llama-cpp backend.
+        server_url (str): Base URL of the OpenAI-compatible server.
+        api_model (str): Model name sent to the server (optional).
+        api_key (str): Bearer token for the server (optional).
+        chat_template (str, optional): Chat template name; backend default if omitted.
+        concurrency (int): Parallel requests for the http backend.
+        max_retries (int): Retries per request for the http backend.
+        timeout (float): Socket timeout in seconds for the http backend.
+
+    Returns:
+        InferenceBackend: The configured backend.
+    """
+    if backend == "llama-cpp":
+        return LlamaCppBackend(model_path, chat_template=chat_template)
+    if backend == "http":
+        if not server_url:
+            raise ValueError("The http backend requires a server URL")
+        return HttpBackend(
+            server_url,
+            model=api_model,
+            api_key=api_key,
+            chat_template=chat_template,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            timeout=timeout,
+        )
+    raise ValueError(f"Unknown backend '{backend}'")
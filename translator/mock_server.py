@@ -0,0 +1,140 @@
+"""
+Local mock of an OpenAI-compatible completions server.
+Lets the http backend be exercised offline: every request echoes the user
+message back as the "translation", optionally failing some requests to
+exercise retries. Gemma has no system turn, so with that template the echo
+is the system prompt followed by the text.
+
+Usage:
+    python translator/mock_server.py --port 8080
+    python translator/translate.py --lang fr --backend http --server-url http://127.0.0.1:8080
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# User turn extractors, one per chat template in backends.CHAT_TEMPLATES
+USER_PATTERNS = [
+    re.compile(r"<\|im_start\|>user\n(.*?)<\|im_end\|>", re.DOTALL),
+    re.compile(r"<\|start_header_id\|>user<\|end_header_id\|>\n\n(.*?)<\|eot_id\|>", re.DOTALL),
+    re.compile(r"<start_of_turn>user\n(.*?)<end_of_turn>", re.DOTALL),
+]
+
+
+def extract_user_text(prompt):
+    """Return the user turn of a rendered prompt, or the prompt itself."""
+    for pattern in USER_PATTERNS:
+        match = pattern.search(prompt)
+        if match:
+            return match.group(1)
+    return prompt
+
+
+class MockCompletionHandler(BaseHTTPRequestHandler):
+    """Serves POST /v1/completions and GET /v1/models over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # response stalls on Nagle + delayed ACK (~40ms) and hides real timing
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """List the single mock model."""
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Echo the user message of a completion request."""
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length)
+
+        if self.path.rstrip("/") != "/v1/completions":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+
+        if server.fail_rate and random.random() < server.fail_rate:
+            headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else None
+            self._send_json(503, {"error": "mock overload"}, headers)
+            return
+
+        try:
+            payload = json.loads(raw)
+            prompt = payload["prompt"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "expected a JSON body with a 'prompt' field"})
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        text = extract_user_text(prompt)
+        self._send_json(
+            200,
+            {
+                "id": f"cmpl-mock-{server.requests}",
+                "object": "text_completion",
+                "model": payload.get("model", "mock"),
+                "choices": [{"index": 0, "text": text, "finish_reason": "stop"}],
+            },
+        )
+
+
+def make_server(host="127.0.0.1", port=8080, latency=0.0, fail_rate=0.0, retry_after=None, quiet=False):
+    """Build a mock server; port 0 picks a free port (see `server.server_address`)."""
+    server = ThreadingHTTPServer((host, port), MockCompletionHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.retry_after = retry_after
+    server.quiet = quiet
+    server.lock = threading.Lock()
+    server.requests = 0
+    # Distinct client sockets seen, to check that connections are being reused
+    server.connections = set()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep per completion")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After seconds sent with failed requests")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    httpd = make_server(args.host, args.port, latency=args.latency, fail_rate=args.fail_rate, retry_after=args.retry_after, quiet=args.quiet)
+    print(f"[INFO] Mock completions server listening on http://{args.host}:{httpd.server_address[1]}", flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
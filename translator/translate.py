@@ -5,6 +5,9 @@ Handles chunking, translation via LLM, and navbar injection.
 import os
 import re
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from backends import CHAT_TEMPLATES, create_backend
 
 LANG_MAP = {
     "de": "German", "fr": "French", "es": "Spanish", "ja": "Japanese",
@@ -386,12 +389,12 @@ def fix_relative_paths(text):
     text = re.sub(r'((?:src|href)=["\'])(?!(?:http|/|#|\.\./))', r'\1../', text)
     return text
 
-def translate_chunk(text, llm, prompts, lang_guidance=None, is_lone_header=False):
-    """Translate a single chunk of text using the LLM.
+def translate_chunk(text, backend, prompts, lang_guidance=None, is_lone_header=False):
+    """Translate a single chunk of text using the inference backend.
 
     Args:
         text (str): The text to translate.
-        llm: The LLM instance.
+        backend (InferenceBackend): The inference backend.
         prompts (dict): Dictionary with 'header' and 'prose' prompts.
         lang_guidance (str, optional): Language-specific guidance.
         is_lone_header (bool): Whether this is a standalone header.
@@ -405,17 +408,10 @@ def translate_chunk(text, llm, prompts, lang_guidance=None, is_lone_header=False
     base_prompt = prompts['prose']
     system_content = f"{lang_guidance}\n\n{base_prompt}" if lang_guidance else base_prompt
 
-    prompt = (
-        f"<|im_start|>system\n/no_think{system_content}<|im_end|>\n"
-        f"<|im_start|>user\n{text}<|im_end|>\n"
-        f"<|im_start|>assistant\n"
-    )
-
     estimated_limit = int(len(text) * 3) + 200
     gen_limit = min(4096, max(256, estimated_limit))
 
-    response = llm(prompt, max_tokens=gen_limit, temperature=0, stop=["<|im_end|>"])
-    translated = response['choices'][0]['text'].strip()
+    translated = backend.complete(system_content, text, max_tokens=gen_limit).strip()
     
     translated = re.sub(r'<think>.*?</think>', '', translated, flags=re.DOTALL).strip()
     
@@ -478,12 +474,38 @@ def load_guidance(lang):
     return ""
 
 
-def process_chunks(chunks, llm, lang, prompts, lang_guidance):
+def _translate_and_validate(i, total, ctext, backend, multiplier, prompts, lang_guidance):
+    """Translate one prose chunk and apply the validation rules.
+
+    Returns:
+        str: The translation, or the original text if validation reverted it.
+    """
+    # Show the full chunk being translated for easier debugging and context
+    print(f"[INFO] Translating chunk {i+1}/{total}:\n{ctext}\n---", flush=True)
+    is_lone_header = ctext.strip().startswith('#') and '\n' not in ctext.strip()
+
+    translated = translate_chunk(ctext, backend, prompts, lang_guidance, is_lone_header)
+
+    # Pipeline Validation Logic
+    if len(translated) > multiplier * len(ctext):
+        print(f"[WARN] Length check failed on chunk {i+1}, reverting."); translated = ctext
+    elif any(f in translated for f in FORBIDDEN):
+        print(f"[WARN] Forbidden phrase detected in chunk {i+1}, Hallucination Warning!.")
+    elif ("</div>" in ctext and "</div>" not in translated) or ("</details>" in ctext and "</details>" not in translated):
+        print(f"[WARN] HTML structural loss in chunk {i+1}, reverting."); translated = ctext
+
+    return translated
+
+
+def process_chunks(chunks, backend, lang, prompts, lang_guidance):
     """Process and translate chunks, applying validation.
 
+    Prose chunks are sent to the backend concurrently, up to
+    `backend.concurrency` at a time; output keeps the original chunk order.
+
     Args:
         chunks (list): List of (type, text) tuples.
-        llm: The LLM instance.
+        backend (InferenceBackend): The inference backend.
         lang (str): Target language code.
         prompts (dict): Prompts dictionary.
         lang_guidance (str): Language guidance.
@@ -491,38 +513,37 @@ def process_chunks(chunks, llm, lang, prompts, lang_guidance):
     Returns:
         str: Processed text.
     """
-    final_output = []
+    final_output = [None] * len(chunks)
     multiplier = HIGH_MULTIPLIER_MAP.get(lang, 3.0)
     total = len(chunks)
 
+    pending = []
     for i, (ctype, ctext) in enumerate(chunks):
         if ctype == 'struct' or not ctext.strip():
-            final_output.append(ctext + '\n\n'); continue
+            final_output[i] = ctext + '\n\n'; continue
+        pending.append((i, ctext))
 
-        # Show the full chunk being translated for easier debugging and context
-        print(f"[INFO] Translating chunk {i+1}/{total}:\n{ctext}\n---", flush=True)
-        is_lone_header = ctext.strip().startswith('#') and '\n' not in ctext.strip()
-        
-        translated = translate_chunk(ctext, llm, prompts, lang_guidance, is_lone_header)
+    def work(item):
+        i, ctext = item
+        return i, _translate_and_validate(i, total, ctext, backend, multiplier, prompts, lang_guidance)
 
-        # Pipeline Validation Logic
-        if len(translated) > multiplier * len(ctext):
-            print(f"[WARN] Length check failed on chunk {i+1}, reverting."); translated = ctext
-        elif any(f in translated for f in FORBIDDEN):
-            print(f"[WARN] Forbidden phrase detected in chunk {i+1}, Hallucination Warning!.")
-        elif ("</div>" in ctext and "</div>" not in translated) or ("</details>" in ctext and "</details>" not in translated):
-            print(f"[WARN] HTML structural loss in chunk {i+1}, reverting."); translated = ctext
+    if backend.concurrency > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(backend.concurrency, len(pending))) as pool:
+            results = list(pool.map(work, pending))
+    else:
+        results = [work(item) for item in pending]
 
-        final_output.append(translated.rstrip() + '\n\n')
+    for i, translated in results:
+        final_output[i] = translated.rstrip() + '\n\n'
 
     return ''.join(final_output)
 
-def run_translation_pipeline(content, llm, lang, prompts, lang_guidance):
+def run_translation_pipeline(content, backend, lang, prompts, lang_guidance):
     """Run the full translation pipeline on content.
 
     Args:
         content (str): The content to translate.
-        llm: The LLM instance.
+        backend (InferenceBackend): The inference backend.
         lang (str): Target language.
         prompts (dict): Prompts.
         lang_guidance (str): Guidance.
@@ -533,7 +554,7 @@ def run_translation_pipeline(content, llm, lang, prompts, lang_guidance):
     chunks = get_smart_chunks(content)
     chunks = merge_small_chunks(chunks)
 
-    full_text = process_chunks(chunks, llm, lang, prompts, lang_guidance)
+    full_text = process_chunks(chunks, backend, lang, prompts, lang_guidance)
     
     # Cleaning Phase
     full_text = strip_think_tokens(full_text)
@@ -605,14 +626,23 @@ def regenerate_all_navbars(readme_path, locales_dir):
     print(f"[SUCCESS] Regenerated navbars for Root and {len(langs)} locales.")
 
 
-def main(lang, model_path='', nav_target='README.md', mode='translate'):
+def main(lang, model_path='', nav_target='README.md', mode='translate', backend='llama-cpp', server_url='', api_model='', api_key='',
+         chat_template=None, concurrency=4, max_retries=3, timeout=600.0):
     """Main entry point for the translation script.
 
     Args:
         lang (str): Target language code.
-        model_path (str): Path to the LLM model.
+        model_path (str): Path to the LLM model (llama-cpp backend).
         nav_target (str): Path to the target README.
         mode (str): 'translate' or 'navbar'.
+        backend (str): 'llama-cpp' (in-process) or 'http' (OpenAI-compatible server).
+        server_url (str): Base URL of the completions server (http backend).
+        api_model (str): Model name sent to the server (http backend).
+        api_key (str): Bearer token for the server (http backend).
+        chat_template (str, optional): Chat template name; backend default if omitted.
+        concurrency (int): Parallel requests (http backend).
+        max_retries (int): Retries per request (http backend).
+        timeout (float): Request timeout in seconds (http backend).
     """
     readme_path = os.path.abspath(nav_target)
     output_dir = os.path.join(os.getcwd(), "locales")
@@ -620,19 +650,23 @@ def main(lang, model_path='', nav_target='README.md', mode='translate'):
     if mode == 'navbar':
         regenerate_all_navbars(readme_path, output_dir); return
 
-    from llama_cpp import Llama
     mp = model_path or os.path.join(BASE_DIR, 'models', 'Qwen3-14B-Q4_K_M.gguf')
-    llm = Llama(model_path=mp, n_ctx=8192, n_threads=4, verbose=False)
+    engine = create_backend(backend, model_path=mp, server_url=server_url, api_model=api_model, api_key=api_key,
+                            chat_template=chat_template, concurrency=concurrency, max_retries=max_retries, timeout=timeout)
+    print(f"[INFO] Backend: {backend} (template: {engine.chat_template}, concurrency: {engine.concurrency})", flush=True)
 
     target_lang_name = LANG_MAP.get(lang, "English")
-    header_prompt, prose_prompt = get_system_prompts(target_lang_name)
+    prose_prompt = get_system_prompts(target_lang_name)
     
     lang_guidance = load_guidance(lang)
 
     os.makedirs(output_dir, exist_ok=True)
     with open(readme_path, 'r', encoding='utf-8') as f: content = f.read()
 
-    translated_text = run_translation_pipeline(content, llm, lang, {'header': header_prompt, 'prose': prose_prompt}, lang_guidance)
+    try:
+        translated_text = run_translation_pipeline(content, engine, lang, {'header': prose_prompt, 'prose': prose_prompt}, lang_guidance)
+    finally:
+        engine.close()
 
     with open(os.path.join(output_dir, f"README.{lang}.md"), 'w', encoding='utf-8') as f:
         f.write(translated_text)
@@ -647,10 +681,21 @@ if __name__ == '__main__':
     parser.add_argument("--model-path", type=str, default="")
     parser.add_argument("--nav-target", type=str, default="README.md")
     parser.add_argument("--mode", type=str, default="translate")
+    parser.add_argument("--backend", type=str, choices=["llama-cpp", "http"], default="llama-cpp")
+    parser.add_argument("--server-url", type=str, default=os.environ.get("TRANSLATOR_SERVER_URL", ""))
+    parser.add_argument("--api-model", type=str, default="")
+    parser.add_argument("--chat-template", type=str, choices=sorted(CHAT_TEMPLATES), default=None)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600.0)
     args = parser.parse_args()
 
 
     if args.mode == "translate" and not args.lang:
         parser.error("the following arguments are required: --lang")
+    if args.mode == "translate" and args.backend == "http" and not args.server_url:
+        parser.error("--backend http requires --server-url")
 
-    main(args.lang, model_path=args.model_path, nav_target=args.nav_target, mode=args.mode)
+    main(args.lang, model_path=args.model_path, nav_target=args.nav_target, mode=args.mode, backend=args.backend,
+         server_url=args.server_url, api_model=args.api_model, api_key=os.environ.get("TRANSLATOR_API_KEY", ""),
+         chat_template=args.chat_template, concurrency=args.concurrency, max_retries=args.max_retries, timeout=args.timeout)